@@ -1,41 +1,99 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, Response, abort, send_file
 from flask_cors import CORS
-from calc_engine import CalculationEngine, ValidationError
-import io, json, os
+from calc_engine import CalculationEngine, ValidationError, quantize_result
+import functools, io, os
+import orjson
 
 app = Flask(__name__)
 CORS(app)  # Add this line
 
 engine = CalculationEngine()
 
+# engine.run is a pure, side-effect-free function of its inputs (dict reads +
+# arithmetic), so results are memoised on a canonical, hashable form of the
+# inputs dict. /api/calculate and /api/report share this cache, so fetching
+# both for the same inputs runs the pipeline once. Cached results are shared
+# between requests and must not be mutated.
+@functools.lru_cache(maxsize=1024)
+def _run_cached(frozen_inputs):
+    return quantize_result(engine.run({k: v for k, _, v in frozen_inputs}))
+
+def run_engine(inputs):
+    inputs = inputs or {}
+    try:
+        # Type names keep 1000, 1000.0 and True/1 apart (they hash equal)
+        frozen_inputs = tuple(sorted((k, type(v).__name__, v) for k, v in inputs.items()))
+        hash(frozen_inputs)
+    except (TypeError, AttributeError):
+        # Unhashable/non-dict payloads skip the cache
+        return quantize_result(engine.run(inputs))
+    return _run_cached(frozen_inputs)
+
+def json_body():
+    try:
+        data = orjson.loads(request.get_data() or b'{}')
+    except orjson.JSONDecodeError:
+        abort(400, 'Malformed JSON body')
+    return data if isinstance(data, dict) else {}
+
+def json_response(obj, status=200):
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+def report_response(res, project):
+    # Werkzeug quotes/RFC 2231-encodes the filename but rejects line breaks
+    if '\r' in project or '\n' in project:
+        return json_response({'error': 'projectName must not contain line breaks'}, 400)
+    bio = io.BytesIO(orjson.dumps(res, option=orjson.OPT_INDENT_2))
+    return send_file(bio, mimetype='application/json', download_name=project + '_report.json', as_attachment=True)
+
 @app.route('/api/health', methods=['GET'])
 def health():
-    return jsonify({'status':'ok'})
+    return json_response({'status':'ok'})
 
 @app.route('/api/calculate', methods=['POST'])
 def calculate():
-    data = request.get_json() or {}
+    data = json_body()
     project = data.get('projectName','unnamed')
     inputs = data.get('inputs', {})
     try:
-        result = engine.run(inputs)
-        return jsonify(result)
+        result = run_engine(inputs)
+        # ?include_report=1 returns the result as the report download directly
+        if request.args.get('include_report') == '1':
+            return report_response(result, project)
+        return json_response(result)
     except ValidationError as e:
-        return jsonify({'error': str(e)}), 400
+        return json_response({'error': str(e)}, 400)
     except Exception as e:
-        return jsonify({'error': 'Internal server error: ' + str(e)}), 500
+        return json_response({'error': 'Internal server error: ' + str(e)}, 500)
+
+@app.route('/api/calculate_batch', methods=['POST'])
+def calculate_batch():
+    data = json_body()
+    inputs_list = data.get('inputs_list', [])
+    try:
+        results = engine.run_batch(inputs_list)
+        return json_response([quantize_result(r) for r in results])
+    except ValidationError as e:
+        return json_response({'error': str(e)}, 400)
+    except Exception as e:
+        return json_response({'error': 'Internal server error: ' + str(e)}, 500)
 
 @app.route('/api/report', methods=['POST'])
 def report():
-    data = request.get_json() or {}
+    data = json_body()
     project = data.get('projectName','report')
     inputs = data.get('inputs', {})
-    res = engine.run(inputs)
-    bio = io.BytesIO()
-    bio.write(json.dumps(res, indent=2).encode('utf-8'))
-    bio.seek(0)
-    return send_file(bio, mimetype='application/json', download_name=project + '_report.json', as_attachment=True)
+    try:
+        res = run_engine(inputs)
+        return report_response(res, project)
+    except ValidationError as e:
+        return json_response({'error': str(e)}, 400)
+    except Exception as e:
+        return json_response({'error': 'Internal server error: ' + str(e)}, 500)
 
+# Local development server only. In production run under a WSGI server, e.g.
+#   gunicorn -w 4 -k gthread --threads 4 app:app
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    debug = os.environ.get('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes')
+    app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
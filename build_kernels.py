@@ -0,0 +1,34 @@
+"""Compile the numeric kernels ahead of time into the geotabs_kernels extension.
+
+Run once at build/deploy time, and again whenever kernels.py changes:
+
+    python build_kernels.py
+
+calc_engine picks the extension up automatically and falls back to the Numba
+JIT kernels when it has not been built or was built from other sources.
+
+Note: numba.pycc has been pending deprecation since Numba 0.57 and will be
+replaced by a new AOT compiler in a future Numba release.
+"""
+import os
+import sys
+from numba.pycc import CC
+
+# Compile from the JIT kernels even if a previous build is importable
+sys.modules['geotabs_kernels'] = None
+from calc_engine import KERNEL_SOURCE_HASH
+import kernels
+
+cc = CC('geotabs_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+for name, signature in kernels.KERNEL_SIGNATURES.items():
+    cc.export(name, signature)(getattr(kernels, name).py_func)
+
+# Lets calc_engine detect a build from outdated kernel sources
+@cc.export('source_hash', 'i8()')
+def source_hash():
+    return KERNEL_SOURCE_HASH
+
+if __name__ == '__main__':
+    cc.compile()
@@ -1,4 +1,12 @@
+import hashlib
 import math
+import os
+import warnings
+import numpy as np
+
+from kernel_constants import (CO2_EMISSION_FACTOR, CAPACITY_THRESHOLDS, CAPACITY_SCORES,
+                              ENERGY_THRESHOLDS, ENERGY_SCORES, PAYBACK_THRESHOLDS,
+                              ECONOMIC_SCORES)
 
 # India-specific climate zones (ECBC-based)
 INDIA_CLIMATE_ZONES = {
@@ -101,10 +109,145 @@ CAPITAL_COST_PER_KW = {
 # Borehole cost per meter
 BOREHOLE_COST_PER_METER = 900  # Rs/meter (realistic for India)
 
+# Part-load operation: buildings rarely run at full load continuously
+DIVERSITY_FACTOR = 0.7
+
+# Building types billed at commercial electricity rates
+COMMERCIAL_BUILDING_TYPES = ("Office", "Hospital", "Hotel", "IT/Tech Park")
+
+def _operating_hours(d):
+    # Hours per day * days per month * months, cooling plus heating
+    return (d["cooling_hours_per_day"] * 30 * d["cooling_months"] +
+            d["heating_hours_per_day"] * 30 * d["heating_months"])
+
+# Structured lookup tables built once at import: a lookup is one dict hash for
+# the row index plus one contiguous array row fetch. Only the per-climate
+# figures the engine reads are kept: suitability, and the operating and
+# diversity-adjusted effective hours, which are constant per climate.
+CLIMATE_IDX = {name: i for i, name in enumerate(INDIA_CLIMATE_ZONES)}
+CLIMATE_ARR = np.array(
+    [(d["suitability_score"], _operating_hours(d), _operating_hours(d) * DIVERSITY_FACTOR)
+     for d in INDIA_CLIMATE_ZONES.values()],
+    dtype=[('suitability', 'i1'), ('total_hours', 'i4'), ('effective_hours', 'f8')]
+)
+DEFAULT_CLIMATE_IDX = CLIMATE_IDX["Composite"]
+
+# Indexed by CLIMATE_IDX; Composite's Rs 20000/kW doubles as the fallback
+CAPITAL_COST_ARR = np.array(
+    [CAPITAL_COST_PER_KW.get(name, 20000) for name in INDIA_CLIMATE_ZONES],
+    dtype='f8'
+)
+
+# (building type, tier) -> cooling intensity (kW/m2)
+INTENSITY_FLAT = {(bt, tier): v for bt, d in INDIA_COOLING_INTENSITY.items() for tier, v in d.items()}
+
+RATES_IDX = {name: i for i, name in enumerate(INDIA_ELECTRICITY_RATES)}
+RATES_ARR = np.array(
+    [(r["commercial"], r["residential"]) for r in INDIA_ELECTRICITY_RATES.values()],
+    dtype=[('commercial', 'f8'), ('residential', 'f8')]
+)
+DEFAULT_RATES_IDX = RATES_IDX["National Average"]
+
+# The numeric kernels (see kernels.py) come from the native extension built by
+# build_kernels.py when it is present and matches the current sources, so
+# worker start pays neither the Numba import nor a JIT compile; otherwise
+# they are JIT-compiled. The build records KERNEL_SOURCE_HASH, covering the
+# kernel sources and signatures plus the score bands compiled into them.
+def _kernel_source_hash():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kernels.py'), 'rb') as f:
+        digest = hashlib.sha256(f.read())
+    for bands in (CAPACITY_THRESHOLDS, CAPACITY_SCORES, ENERGY_THRESHOLDS,
+                  ENERGY_SCORES, PAYBACK_THRESHOLDS, ECONOMIC_SCORES):
+        digest.update(bands.astype('f8').tobytes())
+    # Truncated to a signed 64-bit int so the extension can return it as i8
+    return int.from_bytes(digest.digest()[:8], 'little', signed=True)
+
+KERNEL_SOURCE_HASH = _kernel_source_hash()
+
+try:
+    import geotabs_kernels
+    # Builds predating the hash export count as stale too
+    if getattr(geotabs_kernels, 'source_hash', lambda: None)() != KERNEL_SOURCE_HASH:
+        warnings.warn('geotabs_kernels was built from different kernel sources; '
+                      'using the JIT kernels. Re-run build_kernels.py.', RuntimeWarning)
+        raise ImportError('stale geotabs_kernels build')
+    from geotabs_kernels import (thermal_kernel, ground_loop_kernel, energy_kernel,
+                                 economics_kernel, co2_kernel, score_kernel,
+                                 round_kernel, compute_all)
+except ImportError:
+    from kernels import (thermal_kernel, ground_loop_kernel, energy_kernel,
+                         economics_kernel, co2_kernel, score_kernel,
+                         round_kernel, compute_all, warmup)
+    warmup()
+
+def round_array(values, ndigits):
+    """Vectorised round_kernel(): correctly rounded like the builtin round()"""
+    scale = 10.0 ** ndigits
+    # Huge values overflow the splitting below; they are passed through anyway
+    with np.errstate(over='ignore', invalid='ignore'):
+        hi = values * scale
+        # Dekker's two-product: values * scale == hi + lo exactly
+        t = 134217729.0 * values  # 2**27 + 1
+        xh = t - (t - values)
+        xl = values - xh
+        t = 134217729.0 * scale
+        sh = t - (t - scale)
+        sl = scale - sh
+        lo = ((xh * sh - hi) + xh * sl + xl * sh) + xl * sl
+        # rint() breaks exact halves to even; lo decides whether hi was really one
+        q = np.rint(hi)
+        q += ((hi - q == 0.5) & (lo > 0)).astype('f8') - ((hi - q == -0.5) & (lo < 0)).astype('f8')
+    # 2**52 and beyond is already integral (or inf/nan)
+    return np.where(np.abs(hi) < 4503599627370496.0, q / scale, values)
+
+# Display precision (decimal places) of result fields that nothing downstream
+# consumes; these stay raw floats in the pipeline and are rounded once, by
+# quantize_result(), when a result is serialised. Loads, energy and payback
+# are still rounded in the pipeline because borehole counts and score bands
+# are decided on those rounded figures.
+RESULT_PRECISION = {
+    'ground_loop': {
+        'loop_length_m': 0,
+        'land_area_m2': 0,
+        'watts_per_meter': 1,
+        'borehole_cost_INR': 0
+    },
+    'energy': {'operating_hours': 0, 'effective_hours': 0},
+    'economics': {
+        'geotabs_cost_INR': 2,
+        'baseline_cost_INR': 2,
+        'annual_savings_INR': 2,
+        'capital_cost_INR': 2,
+        'capital_cost_breakdown': {
+            'heat_pump': 2,
+            'ground_loop': 2,
+            'tabs_integration': 2,
+            'controls': 2
+        }
+    },
+    'co2': {'geotabs_tonnes': 3, 'baseline_tonnes': 3, 'savings_tonnes': 3},
+    'co2_savings_tonnes': 3,
+    'weighted_score': 3
+}
+
+def quantize_result(result, precision=RESULT_PRECISION):
+    """Return a copy of a run() result with display-only fields rounded"""
+    out = dict(result)
+    for key, ndigits in precision.items():
+        if key in out:
+            if isinstance(ndigits, dict):
+                out[key] = quantize_result(out[key], ndigits)
+            else:
+                out[key] = round(out[key], ndigits)
+    return out
+
 class ValidationError(Exception):
     pass
 
 class CalculationEngine:
+    __slots__ = ('defaults', 'weights', '_climate_zones', '_climate_idx', '_climate_arr',
+                 '_rates_idx', '_rates_arr', '_cap', '_intensity')
+
     def __init__(self, defaults=None):
         self.defaults = defaults or {}
         self.weights = {
@@ -113,6 +256,15 @@ class CalculationEngine:
             'energy': 0.3,
             'climate': 0.2
         }
+        # Lookup tables bound once so methods resolve them through self
+        # instead of module globals
+        self._climate_zones = INDIA_CLIMATE_ZONES
+        self._climate_idx = CLIMATE_IDX
+        self._climate_arr = CLIMATE_ARR
+        self._rates_idx = RATES_IDX
+        self._rates_arr = RATES_ARR
+        self._cap = CAPITAL_COST_ARR
+        self._intensity = INTENSITY_FLAT
 
     def validate_inputs(self, inputs):
         if 'buildingArea_m2' not in inputs or inputs['buildingArea_m2'] <= 0:
@@ -129,195 +281,25 @@ class CalculationEngine:
         area = inputs.get('buildingArea_m2', 0)
         
         # Get intensity based on building type and tier
-        if btype in INDIA_COOLING_INTENSITY:
-            if isinstance(INDIA_COOLING_INTENSITY[btype], dict):
-                intensity = INDIA_COOLING_INTENSITY[btype].get(tier, 0.15)
-            else:
-                intensity = INDIA_COOLING_INTENSITY[btype]
-        else:
-            intensity = 0.15
-        
-        return area * intensity
-
-    def simple_thermal_model(self, inputs):
-        """Calculate loads and capacity"""
-        load_kW = inputs.get('peakCooling_kW') or self.estimate_peak_cooling(inputs)
-        oversize = inputs.get('oversize_factor', 1.2)
-        capacity_kW = load_kW * oversize
-        c_l_ratio = capacity_kW / max(load_kW, 1e-6)
-        return {
-            'load_kW': round(load_kW, 3), 
-            'capacity_kW': round(capacity_kW, 3), 
-            'c_l_ratio': round(c_l_ratio, 3)
-        }
-
-    def ground_loop_sizing(self, inputs, peak_load_kW):
-        """Calculate ground loop requirements using soil conductivity"""
-        soil_k = inputs.get('soilConductivity_WpmK', 2.0)
-        climate = inputs.get('climate', 'Composite')
-        climate_data = INDIA_CLIMATE_ZONES.get(climate, INDIA_CLIMATE_ZONES['Composite'])
-        
-        # Simplified heat transfer calculation
-        # Typical ground loop: 15-20 W/m depending on soil
-        watts_per_meter = soil_k * 8  # Empirical factor
-        required_loop_length_m = (peak_load_kW * 1000) / watts_per_meter
-        
-        # Assume 100m deep boreholes
-        borehole_count = max(1, round(required_loop_length_m / 100, 0))
-        
-        # Land area assuming 5m x 5m spacing
-        land_area_m2 = borehole_count * 25
-        
-        # Borehole drilling cost
-        borehole_cost = borehole_count * 100 * BOREHOLE_COST_PER_METER
-        
-        return {
-            'loop_length_m': round(required_loop_length_m, 0),
-            'borehole_count': int(borehole_count),
-            'land_area_m2': round(land_area_m2, 0),
-            'watts_per_meter': round(watts_per_meter, 1),
-            'borehole_cost_INR': round(borehole_cost, 0)
-        }
+        return area * self._intensity.get((btype, tier), 0.15)
 
-    def energy_estimate(self, inputs, model_out):
-        """Calculate annual energy consumption - FIXED VERSION"""
-        climate = inputs.get('climate', 'Composite')
-        climate_data = INDIA_CLIMATE_ZONES.get(climate, INDIA_CLIMATE_ZONES['Composite'])
-        
-        # REALISTIC operating hours calculation
-        # Hours per day * days per month * months
-        cooling_hours = (climate_data['cooling_hours_per_day'] * 30 * 
-                        climate_data['cooling_months'])
-        heating_hours = (climate_data['heating_hours_per_day'] * 30 * 
-                        climate_data['heating_months'])
-        total_hours = cooling_hours + heating_hours
-        
-        # Account for part-load operation (diversity factor)
-        diversity_factor = 0.7  # Buildings rarely run at full load continuously
-        effective_hours = total_hours * diversity_factor
-        
-        cop = inputs.get('gsHeatPumpCOP', 4.0)
-        annual_kWh = model_out['load_kW'] * effective_hours / max(cop, 0.1)
-        
-        baseline_cop = inputs.get('baseline_COP', 3.0)
-        baseline_kWh = model_out['load_kW'] * effective_hours / max(baseline_cop, 0.1)
-        
-        savings_kWh = baseline_kWh - annual_kWh
-        
-        return {
-            'annual_kWh': round(annual_kWh, 2),
-            'baseline_kWh': round(baseline_kWh, 2),
-            'savings_kWh': round(savings_kWh, 2),
-            'operating_hours': round(total_hours, 0),
-            'effective_hours': round(effective_hours, 0),
-            'diversity_factor': diversity_factor
-        }
-
-    def economic_analysis(self, inputs, energy_out, model_out, ground_loop):
-        """Calculate costs and payback in Indian Rupees - FIXED VERSION"""
+    def _electricity_rate(self, inputs):
+        """Electricity rate (Rs/kWh) for the state and building category"""
         state = inputs.get('state', 'National Average')
         btype = inputs.get('buildingType', 'Office')
-        climate = inputs.get('climate', 'Composite')
-        
-        # Get electricity rate
-        rate_category = "commercial" if btype in ["Office", "Hospital", "Hotel", "IT/Tech Park"] else "residential"
-        rates = INDIA_ELECTRICITY_RATES.get(state, INDIA_ELECTRICITY_RATES["National Average"])
-        electricity_rate = rates[rate_category]
-        
-        # Annual costs
-        geotabs_cost_INR = energy_out['annual_kWh'] * electricity_rate
-        baseline_cost_INR = energy_out['baseline_kWh'] * electricity_rate
-        annual_savings_INR = energy_out['savings_kWh'] * electricity_rate
-        
-        # REALISTIC Capital cost estimate
-        cost_per_kw = CAPITAL_COST_PER_KW.get(climate, 20000)
-        
-        # Components:
-        # 1. Heat pump equipment
-        heat_pump_cost = model_out['capacity_kW'] * cost_per_kw * 0.3  # 30% of total
-        
-        # 2. Ground loop (boreholes)
-        ground_loop_cost = ground_loop['borehole_cost_INR']
-        
-        # 3. TABS integration (piping in slab)
-        building_area = inputs.get('buildingArea_m2', 1000)
-        tabs_cost = building_area * 1800  # Rs 1800 per m2 for TABS piping
-        
-        # 4. Controls and ancillaries
-        controls_cost = model_out['capacity_kW'] * 2000  # Rs 2000 per kW
-        
-        capital_cost_INR = (heat_pump_cost + ground_loop_cost + 
-                           tabs_cost + controls_cost)
-        
-        # Simple payback
-        if annual_savings_INR > 0:
-            payback_years = capital_cost_INR / annual_savings_INR
-        else:
-            payback_years = 999
-        
-        return {
-            'electricity_rate': electricity_rate,
-            'geotabs_cost_INR': round(geotabs_cost_INR, 2),
-            'baseline_cost_INR': round(baseline_cost_INR, 2),
-            'annual_savings_INR': round(annual_savings_INR, 2),
-            'capital_cost_INR': round(capital_cost_INR, 2),
-            'capital_cost_breakdown': {
-                'heat_pump': round(heat_pump_cost, 2),
-                'ground_loop': round(ground_loop_cost, 2),
-                'tabs_integration': round(tabs_cost, 2),
-                'controls': round(controls_cost, 2)
-            },
-            'payback_years': round(payback_years, 1)
-        }
-
-    def co2_estimate(self, energy_kwh, emission_factor=0.82):
-        """Calculate CO2 emissions in tonnes"""
-        return round(energy_kwh * emission_factor / 1000.0, 3)
+        rate_category = "commercial" if btype in COMMERCIAL_BUILDING_TYPES else "residential"
+        rates = self._rates_arr[self._rates_idx.get(state, DEFAULT_RATES_IDX)]
+        return float(rates[rate_category])
 
-    def ranking_scores(self, inputs, model_out, energy_out, economics):
-        """Calculate feasibility scores"""
-        scores = {}
-        
-        # Load score based on area
-        a = inputs.get('buildingArea_m2', 0)
-        scores['load'] = min(3, max(0, int(a / 500)))
-        
-        # Capacity adequacy
-        cl = model_out['c_l_ratio']
-        scores['capacity'] = 3 if cl >= 1.1 else (2 if cl >= 0.9 else 1)
-        
-        # Energy savings score
-        sk = energy_out['savings_kWh']
-        if sk <= 0:
-            scores['energy'] = 0
-        elif sk < 20000:
-            scores['energy'] = 1
-        elif sk < 50000:
-            scores['energy'] = 2
-        else:
-            scores['energy'] = 3
-        
-        # Climate suitability
-        climate = inputs.get('climate', 'Temperate')
-        climate_data = INDIA_CLIMATE_ZONES.get(climate, INDIA_CLIMATE_ZONES['Composite'])
-        scores['climate'] = climate_data['suitability_score']
-        
-        # Economic score (new)
-        payback = economics['payback_years']
-        if payback < 7:
-            scores['economic'] = 3
-        elif payback < 12:
-            scores['economic'] = 2
-        elif payback < 18:
-            scores['economic'] = 1
-        else:
-            scores['economic'] = 0
-        
-        return scores
-
-    def run(self, inputs):
-        """Main calculation pipeline"""
-        merged = {**self.defaults, **(inputs or {})}
+    def _prepare_inputs(self, inputs):
+        """Merge defaults, fill in peak cooling and validate"""
+        # Only splice in defaults when there are any; otherwise a plain copy.
+        # The copy itself stays: peak cooling is written into it and it is
+        # echoed back as "inputs", so the caller's dict must not be mutated.
+        inputs = inputs or {}
+        if not isinstance(inputs, dict):
+            raise ValidationError('inputs must be an input object')
+        merged = {**self.defaults, **inputs} if self.defaults else {**inputs}
         
         # Auto-estimate peak cooling if missing
         peak = merged.get("peakCooling_kW")
@@ -330,20 +312,11 @@ class CalculationEngine:
         
         # Validate
         self.validate_inputs(merged)
-        
-        # Run calculations
-        model_out = self.simple_thermal_model(merged)
-        ground_loop = self.ground_loop_sizing(merged, model_out['capacity_kW'])
-        energy_out = self.energy_estimate(merged, model_out)
-        economics = self.economic_analysis(merged, energy_out, model_out, ground_loop)
-        
-        # CO2 calculations
-        co2_geotabs = self.co2_estimate(energy_out['annual_kWh'])
-        co2_baseline = self.co2_estimate(energy_out['baseline_kWh'])
-        co2_savings = self.co2_estimate(energy_out['savings_kWh'])
-        
-        # Scoring
-        scores = self.ranking_scores(merged, model_out, energy_out, economics)
+        return merged
+
+    def _build_result(self, merged, model_out, ground_loop, energy_out, economics,
+                      co2_geotabs, co2_baseline, co2_savings, scores):
+        """Assemble the response dict shared by run() and run_batch()"""
         total_score = sum(scores.values())
         
         # Feasibility recommendation (now out of 15 with economic score)
@@ -358,7 +331,7 @@ class CalculationEngine:
         
         # Get climate data for output
         climate = merged.get('climate', 'Composite')
-        climate_data = INDIA_CLIMATE_ZONES.get(climate, INDIA_CLIMATE_ZONES['Composite'])
+        climate_data = self._climate_zones.get(climate, self._climate_zones['Composite'])
         
         return {
             "inputs": merged,
@@ -375,6 +348,192 @@ class CalculationEngine:
             "climate_data": climate_data,
             "scores": scores,
             "total_score": total_score,
-            "weighted_score": round(weighted, 3),
+            "weighted_score": weighted,
             "feasibility_recommendation": feasibility
-        }
\ No newline at end of file
+        }
+
+    def _package_result(self, merged, outputs, total_hours, effective_hours,
+                        electricity_rate, climate_score):
+        """Build the nested result dict from a compute_all() output tuple"""
+        (load_kW, capacity_kW, c_l_ratio,
+         loop_length_m, borehole_count, land_area_m2, watts_per_meter, borehole_cost,
+         annual_kWh, baseline_kWh, savings_kWh,
+         geotabs_cost_INR, baseline_cost_INR, annual_savings_INR, capital_cost_INR,
+         heat_pump_cost, tabs_cost, controls_cost, payback_years,
+         co2_geotabs, co2_baseline, co2_savings,
+         score_load, score_capacity, score_energy, score_economic) = outputs
+        
+        # The kernels work in floats; report ints where the original formulas
+        # stay integral: the 999 no-savings payback, a single borehole, and
+        # figures derived from integer soil conductivity or building area.
+        if not annual_savings_INR > 0:
+            payback_years = 999
+        if borehole_count <= 1:
+            land_area_m2 = int(land_area_m2)
+            borehole_cost = int(borehole_cost)
+        if isinstance(merged.get('soilConductivity_WpmK', 2.0), int):
+            watts_per_meter = int(watts_per_meter)
+        if isinstance(merged.get('buildingArea_m2', 1000), int):
+            tabs_cost = int(tabs_cost)
+        
+        model_out = {'load_kW': load_kW, 'capacity_kW': capacity_kW, 'c_l_ratio': c_l_ratio}
+        ground_loop = {
+            'loop_length_m': loop_length_m,
+            'borehole_count': int(borehole_count),
+            'land_area_m2': land_area_m2,
+            'watts_per_meter': watts_per_meter,
+            'borehole_cost_INR': borehole_cost
+        }
+        energy_out = {
+            'annual_kWh': annual_kWh,
+            'baseline_kWh': baseline_kWh,
+            'savings_kWh': savings_kWh,
+            'operating_hours': total_hours,
+            'effective_hours': effective_hours,
+            'diversity_factor': DIVERSITY_FACTOR
+        }
+        economics = {
+            'electricity_rate': electricity_rate,
+            'geotabs_cost_INR': geotabs_cost_INR,
+            'baseline_cost_INR': baseline_cost_INR,
+            'annual_savings_INR': annual_savings_INR,
+            'capital_cost_INR': capital_cost_INR,
+            'capital_cost_breakdown': {
+                'heat_pump': heat_pump_cost,
+                'ground_loop': borehole_cost,
+                'tabs_integration': tabs_cost,
+                'controls': controls_cost
+            },
+            'payback_years': payback_years
+        }
+        scores = {
+            'load': score_load,
+            'capacity': score_capacity,
+            'energy': score_energy,
+            'climate': climate_score,
+            'economic': score_economic
+        }
+        return self._build_result(merged, model_out, ground_loop, energy_out, economics,
+                                  co2_geotabs, co2_baseline, co2_savings, scores)
+
+    def run(self, inputs):
+        """Main calculation pipeline"""
+        merged = self._prepare_inputs(inputs)
+        
+        climate_idx = self._climate_idx.get(merged.get('climate', 'Composite'), DEFAULT_CLIMATE_IDX)
+        row = self._climate_arr[climate_idx]
+        # The climate score falls back to 'Temperate' when no climate is given
+        score_row = self._climate_arr[self._climate_idx.get(merged.get('climate', 'Temperate'),
+                                                            DEFAULT_CLIMATE_IDX)]
+        load_kW = merged.get('peakCooling_kW') or self.estimate_peak_cooling(merged)
+        effective_hours = float(row['effective_hours'])
+        electricity_rate = self._electricity_rate(merged)
+        
+        # Dict access stays here; the arithmetic runs as one fused kernel
+        outputs = compute_all(
+            float(load_kW), float(merged.get('oversize_factor', 1.2)),
+            float(merged.get('soilConductivity_WpmK', 2.0)), float(BOREHOLE_COST_PER_METER),
+            effective_hours, float(merged.get('gsHeatPumpCOP', 4.0)),
+            float(merged.get('baseline_COP', 3.0)), electricity_rate,
+            float(self._cap[climate_idx]), float(merged.get('buildingArea_m2', 1000)),
+            CO2_EMISSION_FACTOR)
+        
+        return self._package_result(merged, outputs, int(row['total_hours']), effective_hours,
+                                    electricity_rate, int(score_row['suitability']))
+
+    def run_batch(self, inputs_list):
+        """Run the pipeline over a list of scenarios with vectorised arithmetic"""
+        if not isinstance(inputs_list, list):
+            raise ValidationError('inputs_list must be a list of input objects')
+        
+        merged_list = []
+        for i, inputs in enumerate(inputs_list):
+            try:
+                merged_list.append(self._prepare_inputs(inputs))
+            except ValidationError as e:
+                raise ValidationError('inputs_list[%d]: %s' % (i, e))
+        if not merged_list:
+            return []
+        
+        # Stack per-scenario fields into arrays
+        load_raw = np.array([m.get('peakCooling_kW') or self.estimate_peak_cooling(m)
+                             for m in merged_list], dtype='f8')
+        oversize = np.array([m.get('oversize_factor', 1.2) for m in merged_list], dtype='f8')
+        soil_k = np.array([m.get('soilConductivity_WpmK', 2.0) for m in merged_list], dtype='f8')
+        cop = np.array([m.get('gsHeatPumpCOP', 4.0) for m in merged_list], dtype='f8')
+        baseline_cop = np.array([m.get('baseline_COP', 3.0) for m in merged_list], dtype='f8')
+        area = np.array([m.get('buildingArea_m2', 1000) for m in merged_list], dtype='f8')
+        climate_idx = np.array([self._climate_idx.get(m.get('climate', 'Composite'), DEFAULT_CLIMATE_IDX)
+                                for m in merged_list])
+        # The climate score falls back to 'Temperate' when no climate is given
+        score_climate_idx = np.array([self._climate_idx.get(m.get('climate', 'Temperate'), DEFAULT_CLIMATE_IDX)
+                                      for m in merged_list])
+        rates = self._rates_arr[[self._rates_idx.get(m.get('state', 'National Average'), DEFAULT_RATES_IDX)
+                           for m in merged_list]]
+        commercial = np.array([m.get('buildingType', 'Office') in COMMERCIAL_BUILDING_TYPES
+                               for m in merged_list])
+        climate_rows = self._climate_arr[climate_idx]
+        
+        # Thermal model
+        load_kW = round_array(load_raw, 3)
+        capacity_raw = load_raw * oversize
+        capacity_kW = round_array(capacity_raw, 3)
+        c_l_ratio = round_array(capacity_raw / np.maximum(load_raw, 1e-6), 3)
+        
+        # Ground loop
+        watts_per_meter = soil_k * 8
+        loop_length = capacity_kW * 1000 / watts_per_meter
+        borehole_count = np.maximum(1, np.rint(loop_length / 100))
+        land_area = borehole_count * 25
+        borehole_cost = borehole_count * 100 * BOREHOLE_COST_PER_METER
+        
+        # Energy
+        total_hours = climate_rows['total_hours']
+        effective_hours = climate_rows['effective_hours']
+        annual_raw = load_kW * effective_hours / np.maximum(cop, 0.1)
+        baseline_raw = load_kW * effective_hours / np.maximum(baseline_cop, 0.1)
+        annual_kWh = round_array(annual_raw, 2)
+        baseline_kWh = round_array(baseline_raw, 2)
+        savings_kWh = round_array(baseline_raw - annual_raw, 2)
+        
+        # Economics
+        electricity_rate = np.where(commercial, rates['commercial'], rates['residential'])
+        annual_savings = savings_kWh * electricity_rate
+        heat_pump_cost = capacity_kW * self._cap[climate_idx] * 0.3
+        tabs_cost = area * 1800
+        controls_cost = capacity_kW * 2000
+        capital_cost = heat_pump_cost + borehole_cost + tabs_cost + controls_cost
+        payback_years = round_array(
+            np.divide(capital_cost, annual_savings, out=np.full_like(capital_cost, 999.0),
+                      where=annual_savings > 0), 1)
+        
+        # CO2 (tonnes)
+        co2_geotabs = annual_kWh * CO2_EMISSION_FACTOR / 1000.0
+        co2_baseline = baseline_kWh * CO2_EMISSION_FACTOR / 1000.0
+        co2_savings = savings_kWh * CO2_EMISSION_FACTOR / 1000.0
+        
+        # Scores
+        score_load = np.clip((area / 500).astype(int), 0, 3)
+        score_capacity = CAPACITY_SCORES[np.searchsorted(CAPACITY_THRESHOLDS, c_l_ratio, side='right')]
+        score_energy = ENERGY_SCORES[np.searchsorted(ENERGY_THRESHOLDS, savings_kWh, side='right')]
+        score_climate = self._climate_arr['suitability'][score_climate_idx]
+        score_economic = ECONOMIC_SCORES[np.searchsorted(PAYBACK_THRESHOLDS, payback_years, side='right')]
+        
+        # Package per-row results
+        columns = [
+            a.tolist() for a in (
+                load_kW, capacity_kW, c_l_ratio,
+                loop_length, borehole_count, land_area, watts_per_meter, borehole_cost,
+                annual_kWh, baseline_kWh, savings_kWh,
+                annual_kWh * electricity_rate, baseline_kWh * electricity_rate,
+                annual_savings, capital_cost, heat_pump_cost, tabs_cost, controls_cost,
+                payback_years, co2_geotabs, co2_baseline, co2_savings,
+                score_load, score_capacity, score_energy, score_economic
+            )
+        ]
+        return [
+            self._package_result(merged, outputs, hours, eff_hours, rate, s_climate)
+            for merged, outputs, hours, eff_hours, rate, s_climate in zip(
+                merged_list, zip(*columns), total_hours.tolist(), effective_hours.tolist(),
+                electricity_rate.tolist(), score_climate.tolist())
+        ]
@@ -0,0 +1,19 @@
+"""Constants shared by calc_engine and the numeric kernels in kernels.py.
+
+Kept free of Numba and of calc_engine so either module can import them
+first; the score bands are compiled into the kernels.
+"""
+import numpy as np
+
+# Grid emission factor (kg CO2/kWh)
+CO2_EMISSION_FACTOR = 0.82
+
+# Score bands: a value scores *_SCORES[np.searchsorted(*_THRESHOLDS, value,
+# side='right')], i.e. by how many thresholds it has reached. Energy savings
+# only score once strictly positive, hence the smallest positive float.
+CAPACITY_THRESHOLDS = np.array([0.9, 1.1])
+CAPACITY_SCORES = np.array([1, 2, 3])
+ENERGY_THRESHOLDS = np.array([np.nextafter(0.0, 1.0), 20000.0, 50000.0])
+ENERGY_SCORES = np.array([0, 1, 2, 3])
+PAYBACK_THRESHOLDS = np.array([7.0, 12.0, 18.0])
+ECONOMIC_SCORES = np.array([3, 2, 1, 0])
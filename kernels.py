@@ -0,0 +1,168 @@
+"""Numba JIT definitions of the numeric kernels.
+
+Only imported when the ahead-of-time geotabs_kernels extension is missing or
+stale, and by build_kernels.py, so serving from a built extension never loads
+Numba.
+"""
+import numpy as np
+from numba import njit
+
+from kernel_constants import (CO2_EMISSION_FACTOR, CAPACITY_THRESHOLDS, CAPACITY_SCORES,
+                              ENERGY_THRESHOLDS, ENERGY_SCORES, PAYBACK_THRESHOLDS,
+                              ECONOMIC_SCORES)
+
+# Numeric kernels, compiled in nopython mode. They take float scalars and
+# return raw (unrounded) tuples; compute_all() chains them and applies the
+# working-precision rounding.
+@njit(cache=True)
+def thermal_kernel(load_kW, oversize):
+    capacity_kW = load_kW * oversize
+    c_l_ratio = capacity_kW / max(load_kW, 1e-6)
+    return capacity_kW, c_l_ratio
+
+@njit(cache=True)
+def ground_loop_kernel(peak_load_kW, soil_k, borehole_cost_per_m):
+    # Typical ground loop: 15-20 W/m depending on soil
+    watts_per_meter = soil_k * 8  # Empirical factor
+    required_loop_length_m = (peak_load_kW * 1000) / watts_per_meter
+    # Assume 100m deep boreholes
+    borehole_count = max(1.0, np.rint(required_loop_length_m / 100))
+    # Land area assuming 5m x 5m spacing
+    land_area_m2 = borehole_count * 25
+    borehole_cost = borehole_count * 100 * borehole_cost_per_m
+    return (required_loop_length_m, borehole_count, land_area_m2,
+            watts_per_meter, borehole_cost)
+
+@njit(cache=True)
+def energy_kernel(load_kW, effective_hours, cop, baseline_cop):
+    annual_kWh = load_kW * effective_hours / max(cop, 0.1)
+    baseline_kWh = load_kW * effective_hours / max(baseline_cop, 0.1)
+    return annual_kWh, baseline_kWh, baseline_kWh - annual_kWh
+
+@njit(cache=True)
+def economics_kernel(annual_kWh, baseline_kWh, savings_kWh, electricity_rate,
+                     capacity_kW, cost_per_kw, ground_loop_cost, building_area):
+    geotabs_cost_INR = annual_kWh * electricity_rate
+    baseline_cost_INR = baseline_kWh * electricity_rate
+    annual_savings_INR = savings_kWh * electricity_rate
+    heat_pump_cost = capacity_kW * cost_per_kw * 0.3  # 30% of total
+    tabs_cost = building_area * 1800  # Rs 1800 per m2 for TABS piping
+    controls_cost = capacity_kW * 2000  # Rs 2000 per kW
+    capital_cost_INR = (heat_pump_cost + ground_loop_cost +
+                        tabs_cost + controls_cost)
+    if annual_savings_INR > 0:
+        payback_years = capital_cost_INR / annual_savings_INR
+    else:
+        payback_years = 999.0
+    return (geotabs_cost_INR, baseline_cost_INR, annual_savings_INR,
+            capital_cost_INR, heat_pump_cost, tabs_cost, controls_cost,
+            payback_years)
+
+@njit(cache=True)
+def co2_kernel(energy_kwh, emission_factor):
+    return energy_kwh * emission_factor / 1000.0
+
+@njit(cache=True)
+def score_kernel(area, c_l_ratio, savings_kWh, payback_years):
+    load = min(3, max(0, int(area / 500)))
+    capacity = CAPACITY_SCORES[np.searchsorted(CAPACITY_THRESHOLDS, c_l_ratio, side='right')]
+    energy = ENERGY_SCORES[np.searchsorted(ENERGY_THRESHOLDS, savings_kWh, side='right')]
+    economic = ECONOMIC_SCORES[np.searchsorted(PAYBACK_THRESHOLDS, payback_years, side='right')]
+    return load, capacity, energy, economic
+
+@njit(cache=True)
+def round_kernel(x, ndigits):
+    # Correctly rounded like the builtin round(); numba's own round() scales
+    # by 10**ndigits and can disagree in the last digit.
+    scale = 10.0 ** ndigits
+    hi = x * scale
+    if not abs(hi) < 4503599627370496.0:  # 2**52: already integral (or inf/nan)
+        return x
+    # Dekker's two-product: x * scale == hi + lo exactly
+    t = 134217729.0 * x  # 2**27 + 1
+    xh = t - (t - x)
+    xl = x - xh
+    t = 134217729.0 * scale
+    sh = t - (t - scale)
+    sl = scale - sh
+    lo = ((xh * sh - hi) + xh * sl + xl * sh) + xl * sl
+    # rint() breaks exact halves to even; lo decides whether hi was really one
+    q = np.rint(hi)
+    if hi - q == 0.5 and lo > 0:
+        q += 1.0
+    elif hi - q == -0.5 and lo < 0:
+        q -= 1.0
+    return q / scale
+
+@njit(cache=True)
+def compute_all(load_kW, oversize, soil_k, borehole_cost_per_m, effective_hours,
+                cop, baseline_cop, electricity_rate, cost_per_kw, building_area,
+                emission_factor):
+    """Whole numeric pipeline in one kernel, returning a flat result tuple.
+
+    Applies the same working-precision rounding as the step-by-step methods.
+    """
+    # Thermal model
+    capacity_kW, c_l_ratio = thermal_kernel(load_kW, oversize)
+    load_kW = round_kernel(load_kW, 3)
+    capacity_kW = round_kernel(capacity_kW, 3)
+    c_l_ratio = round_kernel(c_l_ratio, 3)
+    
+    # Ground loop
+    (loop_length_m, borehole_count, land_area_m2,
+     watts_per_meter, borehole_cost) = ground_loop_kernel(
+        capacity_kW, soil_k, borehole_cost_per_m)
+    
+    # Energy
+    annual_kWh, baseline_kWh, savings_kWh = energy_kernel(
+        load_kW, effective_hours, cop, baseline_cop)
+    annual_kWh = round_kernel(annual_kWh, 2)
+    baseline_kWh = round_kernel(baseline_kWh, 2)
+    savings_kWh = round_kernel(savings_kWh, 2)
+    
+    # Economics
+    (geotabs_cost_INR, baseline_cost_INR, annual_savings_INR,
+     capital_cost_INR, heat_pump_cost, tabs_cost, controls_cost,
+     payback_years) = economics_kernel(
+        annual_kWh, baseline_kWh, savings_kWh, electricity_rate,
+        capacity_kW, cost_per_kw, borehole_cost, building_area)
+    payback_years = round_kernel(payback_years, 1)
+    
+    # CO2 and scores
+    co2_geotabs = co2_kernel(annual_kWh, emission_factor)
+    co2_baseline = co2_kernel(baseline_kWh, emission_factor)
+    co2_savings = co2_kernel(savings_kWh, emission_factor)
+    score_load, score_capacity, score_energy, score_economic = score_kernel(
+        building_area, c_l_ratio, savings_kWh, payback_years)
+    
+    return (load_kW, capacity_kW, c_l_ratio,
+            loop_length_m, borehole_count, land_area_m2, watts_per_meter, borehole_cost,
+            annual_kWh, baseline_kWh, savings_kWh,
+            geotabs_cost_INR, baseline_cost_INR, annual_savings_INR, capital_cost_INR,
+            heat_pump_cost, tabs_cost, controls_cost, payback_years,
+            co2_geotabs, co2_baseline, co2_savings,
+            score_load, score_capacity, score_energy, score_economic)
+
+def warmup():
+    # Compile (or load from the on-disk cache) at import so the first
+    # request doesn't pay the JIT cost.
+    thermal_kernel(100.0, 1.2)
+    ground_loop_kernel(120.0, 2.0, 900.0)
+    energy_kernel(100.0, 1890.0, 4.0, 3.0)
+    economics_kernel(47250.0, 63000.0, 15750.0, 9.5, 120.0, 20000.0, 90000.0, 1000.0)
+    co2_kernel(47250.0, 0.82)
+    score_kernel(1000.0, 1.2, 15750.0, 12.0)
+    round_kernel(2.675, 2)
+    compute_all(100.0, 1.2, 2.0, 900.0, 1890.0, 4.0, 3.0, 9.5, 20000.0, 1000.0, CO2_EMISSION_FACTOR)
+
+# name -> signature for the ahead-of-time build in build_kernels.py
+KERNEL_SIGNATURES = {
+    'thermal_kernel': 'UniTuple(f8, 2)(f8, f8)',
+    'ground_loop_kernel': 'UniTuple(f8, 5)(f8, f8, f8)',
+    'energy_kernel': 'UniTuple(f8, 3)(f8, f8, f8, f8)',
+    'economics_kernel': 'UniTuple(f8, 8)(f8, f8, f8, f8, f8, f8, f8, f8)',
+    'co2_kernel': 'f8(f8, f8)',
+    'score_kernel': 'UniTuple(i8, 4)(f8, f8, f8, f8)',
+    'round_kernel': 'f8(f8, i8)',
+    'compute_all': 'Tuple((%s, i8, i8, i8, i8))(%s)' % (', '.join(['f8'] * 22), ', '.join(['f8'] * 11)),
+}
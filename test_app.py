@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from app import app, _run_cached
+
+
+@pytest.fixture
+def client():
+    _run_cached.cache_clear()
+    return app.test_client()
+
+
+def calculate(client, inputs):
+    response = client.post('/api/calculate', json={'inputs': inputs})
+    assert response.status_code == 200
+    return json.loads(response.get_data())
+
+
+def test_cache_keeps_int_and_float_inputs_apart(client):
+    as_int = calculate(client, {'buildingArea_m2': 1000})
+    as_float = calculate(client, {'buildingArea_m2': 1000.0})
+    assert type(as_int['inputs']['buildingArea_m2']) is int
+    assert type(as_float['inputs']['buildingArea_m2']) is float
+    assert type(as_int['economics']['capital_cost_breakdown']['tabs_integration']) is int
+    assert type(as_float['economics']['capital_cost_breakdown']['tabs_integration']) is float
+    assert _run_cached.cache_info().currsize == 2
+
+
+def test_unhashable_inputs_skip_the_cache(client):
+    inputs = {'buildingArea_m2': 1000, 'tags': ['school', 'retrofit']}
+    result = calculate(client, inputs)
+    assert result['inputs']['tags'] == ['school', 'retrofit']
+    assert _run_cached.cache_info().currsize == 0
+
+
+def test_cached_results_are_not_mutated(client):
+    inputs = {'buildingArea_m2': 2500, 'climate': 'Hot-Dry'}
+    first = calculate(client, inputs)
+    assert calculate(client, inputs) == first
+    assert _run_cached.cache_info().hits == 1
+
+
+def test_report_matches_calculate(client):
+    inputs = {'buildingArea_m2': 2500, 'climate': 'Cold'}
+    response = client.post('/api/report', json={'projectName': 'Campus', 'inputs': inputs})
+    assert response.status_code == 200
+    assert json.loads(response.get_data()) == calculate(client, inputs)
+
+
+@pytest.mark.parametrize('url', ['/api/report', '/api/calculate?include_report=1'])
+def test_report_rejects_invalid_inputs(client, url):
+    response = client.post(url, json={'projectName': 'Campus', 'inputs': {}})
+    assert response.status_code == 400
+    assert 'buildingArea_m2' in response.get_json()['error']
+
+
+def test_calculate_include_report(client):
+    inputs = {'buildingArea_m2': 1200, 'climate': 'Warm-Humid'}
+    response = client.post('/api/calculate?include_report=1',
+                           json={'projectName': 'Campus', 'inputs': inputs})
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'] == 'attachment; filename=Campus_report.json'
+    assert json.loads(response.get_data()) == calculate(client, inputs)
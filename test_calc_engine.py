@@ -0,0 +1,122 @@
+import json
+import os
+import random
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from calc_engine import (CalculationEngine, ValidationError, round_kernel, round_array,
+                         quantize_result, INDIA_CLIMATE_ZONES, INDIA_COOLING_INTENSITY,
+                         INDIA_ELECTRICITY_RATES)
+
+
+def random_inputs(rng):
+    inputs = {'buildingArea_m2': rng.choice([rng.randint(1, 20000), round(rng.uniform(1, 20000), 2)])}
+    optional = [
+        ('climate', lambda: rng.choice(list(INDIA_CLIMATE_ZONES) + ['Unknown'])),
+        ('state', lambda: rng.choice(list(INDIA_ELECTRICITY_RATES) + ['Unknown'])),
+        ('buildingType', lambda: rng.choice(list(INDIA_COOLING_INTENSITY) + ['Unknown'])),
+        ('buildingTier', lambda: rng.choice(['Tier-1', 'Tier-2', 'Tier-3'])),
+        ('peakCooling_kW', lambda: round(rng.uniform(1, 3000), 1)),
+        ('gsHeatPumpCOP', lambda: round(rng.uniform(2, 6), 1)),
+        ('baseline_COP', lambda: round(rng.uniform(2, 4), 1)),
+        ('oversize_factor', lambda: round(rng.uniform(0.8, 1.5), 2)),
+        ('soilConductivity_WpmK', lambda: rng.choice([1.4, 1.6, 1.8, 2, 2.2, 2.5, 3])),
+    ]
+    for key, value in optional:
+        if rng.random() < 0.5:
+            inputs[key] = value()
+    return inputs
+
+
+def test_kernels_import_on_their_own():
+    # A fresh interpreter, so calc_engine has not already loaded kernels
+    subprocess.run([sys.executable, '-c', 'import kernels'], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('ndigits', [0, 1, 2, 3])
+def test_round_kernel_matches_builtin_round(ndigits):
+    rng = random.Random(ndigits)
+    for _ in range(20000):
+        x = rng.uniform(-1e9, 1e9)
+        if rng.random() < 0.5:
+            # Values sitting on a decimal half, the cases naive rounding gets wrong
+            x = round(x, ndigits + 1)
+        assert round_kernel(x, ndigits) == round(x, ndigits), x
+
+
+def test_round_kernel_passes_through_large_values():
+    assert round_kernel(1e300, 2) == 1e300
+    assert round_kernel(2.0 ** 60, 3) == 2.0 ** 60
+
+
+@pytest.mark.parametrize('ndigits', [0, 1, 2, 3])
+def test_round_array_matches_builtin_round(ndigits):
+    rng = random.Random(ndigits)
+    values = [rng.uniform(-1e9, 1e9) for _ in range(20000)]
+    values = [round(x, ndigits + 1) if rng.random() < 0.5 else x for x in values]
+    values += [1e300, -2.0 ** 60, 0.0]
+    expected = [round(x, ndigits) for x in values]
+    assert round_array(np.array(values), ndigits).tolist() == expected
+
+
+def test_run_batch_matches_run():
+    engine = CalculationEngine()
+    rng = random.Random(1)
+    cases = [random_inputs(rng) for _ in range(2000)]
+    expected = [engine.run(case) for case in cases]
+    assert engine.run_batch(cases) == expected
+    # Same fields in the same order, not just equal values
+    assert [list(r['scores']) for r in engine.run_batch(cases)] == [list(r['scores']) for r in expected]
+
+
+def test_run_batch_rejects_bad_entries():
+    engine = CalculationEngine()
+    assert engine.run_batch([]) == []
+    with pytest.raises(ValidationError, match=r'inputs_list\[1\]'):
+        engine.run_batch([{'buildingArea_m2': 100}, 1])
+    with pytest.raises(ValidationError, match=r'inputs_list\[0\]'):
+        engine.run_batch([{'buildingArea_m2': -5}])
+
+
+@pytest.mark.parametrize('inputs', [[['buildingArea_m2', 1000]], 'x', 5])
+def test_run_rejects_non_object_inputs(inputs):
+    engine = CalculationEngine()
+    with pytest.raises(ValidationError, match='input object'):
+        engine.run(inputs)
+    with pytest.raises(ValidationError, match=r'inputs_list\[0\]: inputs must be an input object'):
+        engine.run_batch([inputs])
+
+
+def test_integral_results_stay_ints():
+    engine = CalculationEngine()
+    # Tiny building: a single borehole, and no savings against the better baseline COP
+    inputs = {'buildingArea_m2': 10, 'soilConductivity_WpmK': 2, 'baseline_COP': 5}
+    for result in (engine.run(inputs), engine.run_batch([inputs])[0]):
+        assert result['economics']['payback_years'] == 999
+        assert type(result['economics']['payback_years']) is int
+        assert type(result['ground_loop']['watts_per_meter']) is int
+        assert type(result['ground_loop']['land_area_m2']) is int
+        assert type(result['ground_loop']['borehole_cost_INR']) is int
+        assert type(result['economics']['capital_cost_breakdown']['tabs_integration']) is int
+    result = engine.run({'buildingArea_m2': 5000.0, 'soilConductivity_WpmK': 2.2})
+    assert type(result['ground_loop']['watts_per_meter']) is float
+    assert type(result['economics']['capital_cost_breakdown']['tabs_integration']) is float
+
+
+def test_run_matches_golden_results():
+    # Expected results were produced by the engine as it stood before the
+    # numeric kernels; json.dumps compares values, int/float types and key order.
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden_results.json')
+    with open(path) as f:
+        golden = json.load(f)
+    engine = CalculationEngine()
+    results = [quantize_result(engine.run(case['inputs'])) for case in golden]
+    batch = [quantize_result(r) for r in engine.run_batch([case['inputs'] for case in golden])]
+    for case, result, batch_result in zip(golden, results, batch):
+        expected = json.dumps(case['result'])
+        assert json.dumps(result) == expected, case['inputs']
+        assert json.dumps(batch_result) == expected, case['inputs']